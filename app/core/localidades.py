@@ -0,0 +1,202 @@
+"""
+Índice de municípios: radiação solar, concessionária e tensão da rede.
+
+O índice é gerado a partir de `app/data/municipios.csv` e gravado em um arquivo binário
+compacto (`app/data/municipios.idx`), aberto com mmap. A busca normaliza o nome da cidade
+e resolve em O(1) por uma tabela hash com sondagem linear, sem ler nem parsear arquivos
+a cada proposta.
+
+Para regenerar o índice após editar o CSV:
+    python -m app.core.localidades app/data/municipios.csv app/data/municipios.idx
+
+Layout (little-endian):
+    cabeçalho  MAGIC, n_slots (u32), n_registros (u32), n_textos (u32)
+    slots      n_slots x (hash u64, registro u32, chave: offset u32, tamanho u16)
+    registros  n_registros x (concessionária u16, tensão u16, radiação u16 [centésimos])
+    textos     n_textos x (offset u32, tamanho u16)
+    blob       chaves e textos em UTF-8
+"""
+import unicodedata
+import hashlib
+import struct
+import mmap
+import csv
+import sys
+import os
+import re
+
+MAGIC = b"MUNIDX02"
+HEADER = struct.Struct("<8sIII")
+SLOT = struct.Struct("<QIIH")
+REGISTRO = struct.Struct("<HHH")
+TEXTO = struct.Struct("<IH")
+
+UFS = {
+    "ac", "al", "ap", "am", "ba", "ce", "df", "es", "go", "ma", "mt", "ms", "mg", "pa",
+    "pb", "pr", "pe", "pi", "rj", "rn", "rs", "ro", "rr", "sc", "sp", "se", "to"
+}
+
+
+def normalizar_cidade(cidade):
+    """
+    Converte "Ibitinga/SP", "Bauru-SP" ou "São Paulo - sp" na chave "ibitinga|sp".
+
+    Sem UF reconhecível, retorna só o nome normalizado (ex: "bauru").
+    """
+    texto = unicodedata.normalize("NFKD", str(cidade))
+    texto = "".join(ch for ch in texto if not unicodedata.combining(ch)).lower()
+    palavras = re.sub(r"[^a-z0-9]+", " ", texto).split()
+    if len(palavras) > 1 and palavras[-1] in UFS:
+        return f"{' '.join(palavras[:-1])}|{palavras[-1]}"
+    return " ".join(palavras)
+
+
+def _hash(chave):
+    # Hash estável entre processos (hash() do Python é randomizado); 0 marca slot vazio
+    return int.from_bytes(hashlib.blake2b(chave, digest_size=8).digest(), "little") or 1
+
+
+class IndiceLocalidades:
+    """Consulta ao índice de municípios, mapeado em memória."""
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho or os.getenv("LOCALIDADES_INDEX", "app/data/municipios.idx")
+        self._mm = None
+        self._disponivel = None
+
+    def abrir(self):
+        """
+        Abre e valida o índice. Sem o arquivo, as buscas retornam None (valores padrão
+        da proposta); um arquivo corrompido ou de outra versão levanta RuntimeError,
+        por ser um problema do servidor e não da requisição.
+        """
+        if not os.path.exists(self.caminho):
+            self._disponivel = False
+            return
+        tamanho = os.path.getsize(self.caminho)
+        if tamanho < HEADER.size:
+            raise RuntimeError(f"Índice de localidades inválido (truncado): {self.caminho}")
+        with open(self.caminho, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, n_slots, n_registros, n_textos = HEADER.unpack_from(mm, 0)
+        off_registros = HEADER.size + n_slots * SLOT.size
+        off_textos = off_registros + n_registros * REGISTRO.size
+        off_blob = off_textos + n_textos * TEXTO.size
+        if magic != MAGIC or n_slots == 0 or n_slots & (n_slots - 1) or off_blob > tamanho:
+            mm.close()
+            raise RuntimeError(
+                f"Índice de localidades inválido: {self.caminho}. "
+                "Regenere com: python -m app.core.localidades app/data/municipios.csv app/data/municipios.idx"
+            )
+
+        self._mm = mm
+        self._n_slots = n_slots
+        self._off_registros = off_registros
+        self._off_textos = off_textos
+        self._off_blob = off_blob
+        self._disponivel = True
+
+    def _texto(self, indice):
+        offset, tamanho = TEXTO.unpack_from(self._mm, self._off_textos + indice * TEXTO.size)
+        inicio = self._off_blob + offset
+        return self._mm[inicio:inicio + tamanho].decode("utf-8")
+
+    def buscar(self, cidade):
+        """Retorna os dados do município, ou None se a cidade não estiver no índice."""
+        if self._disponivel is None:
+            self.abrir()
+        if not self._disponivel or not cidade:
+            return None
+
+        chave = normalizar_cidade(cidade).encode("utf-8")
+        h = _hash(chave)
+        slot = h & (self._n_slots - 1)
+        while True:
+            slot_h, registro, chave_off, chave_len = SLOT.unpack_from(self._mm, HEADER.size + slot * SLOT.size)
+            if slot_h == 0:
+                return None
+            inicio = self._off_blob + chave_off
+            if slot_h == h and self._mm[inicio:inicio + chave_len] == chave:
+                break
+            slot = (slot + 1) & (self._n_slots - 1)
+
+        concessionaria, tensao, radiacao = REGISTRO.unpack_from(
+            self._mm, self._off_registros + registro * REGISTRO.size
+        )
+        return {
+            "concessionaria": self._texto(concessionaria),
+            "tensao": self._texto(tensao),
+            "radiacao_solar": radiacao / 100
+        }
+
+
+def construir_indice(caminho_csv, caminho_idx):
+    """Gera o índice binário a partir do CSV de municípios."""
+    with open(caminho_csv, "r", encoding="utf-8") as f:
+        linhas = list(csv.DictReader(f))
+
+    textos, ids_textos = [], {}
+    blob = bytearray()
+
+    def adicionar_blob(valor):
+        dados = valor.encode("utf-8")
+        offset = len(blob)
+        blob.extend(dados)
+        return offset, len(dados)
+
+    def texto_id(valor):
+        if valor not in ids_textos:
+            ids_textos[valor] = len(textos)
+            textos.append(adicionar_blob(valor))
+        return ids_textos[valor]
+
+    registros, chaves = [], {}
+    nomes_sem_uf = {}
+    for i, linha in enumerate(linhas):
+        registros.append(REGISTRO.pack(
+            texto_id(linha["concessionaria"].strip()),
+            texto_id(linha["tensao"].strip()),
+            round(float(linha["radiacao_solar"]) * 100)
+        ))
+        chave = normalizar_cidade(f"{linha['municipio']}-{linha['uf']}")
+        if chave in chaves:
+            raise ValueError(f"Município duplicado no CSV: {linha['municipio']}-{linha['uf']}")
+        chaves[chave] = i
+        nomes_sem_uf.setdefault(chave.split("|")[0], []).append(i)
+
+    # O nome sem UF também é indexado quando não é ambíguo entre estados
+    for nome, indices in nomes_sem_uf.items():
+        if len(indices) == 1:
+            chaves[nome] = indices[0]
+
+    n_slots = 1
+    while n_slots < len(chaves) * 2:
+        n_slots *= 2
+    slots = [None] * n_slots
+    for chave, registro in chaves.items():
+        chave_bytes = chave.encode("utf-8")
+        h = _hash(chave_bytes)
+        slot = h & (n_slots - 1)
+        while slots[slot] is not None:
+            slot = (slot + 1) & (n_slots - 1)
+        slots[slot] = SLOT.pack(h, registro, *adicionar_blob(chave))
+
+    with open(caminho_idx, "wb") as f:
+        f.write(HEADER.pack(MAGIC, n_slots, len(registros), len(textos)))
+        for slot in slots:
+            f.write(slot or SLOT.pack(0, 0, 0, 0))
+        for registro in registros:
+            f.write(registro)
+        for offset, tamanho in textos:
+            f.write(TEXTO.pack(offset, tamanho))
+        f.write(blob)
+    return len(registros), len(chaves)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python -m app.core.localidades <municipios.csv> <municipios.idx>")
+        sys.exit(1)
+    n_registros, n_chaves = construir_indice(sys.argv[1], sys.argv[2])
+    print(f"Índice gerado: {n_registros} municípios, {n_chaves} chaves -> {sys.argv[2]}")
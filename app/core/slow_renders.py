@@ -0,0 +1,190 @@
+import cProfile
+import pstats
+import marshal
+import zipfile
+import threading
+import random
+import time
+import sys
+import json
+import uuid
+import io
+import os
+import re
+from collections import Counter
+from datetime import datetime
+
+
+class AmostradorPilha(threading.Thread):
+    """
+    Amostra periodicamente a pilha de chamadas de uma thread, sem instrumentar cada chamada.
+
+    O custo é de uma leitura de pilha por intervalo, por isso pode ficar sempre ligado.
+    As amostras são agregadas no formato "folded" (func;func;func contagem), o mesmo
+    aceito por flamegraph.pl e speedscope.
+    """
+
+    def __init__(self, thread_id, intervalo_s):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.intervalo_s = intervalo_s
+        self.pilhas = Counter()
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo_s):
+            frame = sys._current_frames().get(self.thread_id)
+            pilha = []
+            while frame is not None:
+                codigo = frame.f_code
+                # Linha de definição (não a linha atual): cada função vira um único nó no flamegraph
+                pilha.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})")
+                frame = frame.f_back
+            if pilha:
+                self.pilhas[";".join(reversed(pilha))] += 1
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+
+    def folded(self):
+        return "\n".join(f"{pilha} {n}" for pilha, n in self.pilhas.most_common())
+
+
+class SlowRenderCapture:
+    """
+    Mede todas as renderizações e guarda as que ultrapassam o limite de latência.
+
+    Toda renderização roda com o `AmostradorPilha` (baixo custo), então qualquer
+    renderização lenta gera captura, e o perfil padrão da captura são as pilhas
+    amostradas (`stacks.folded`), não um dump do cProfile. O cProfile deixa a
+    renderização cerca de 3x mais lenta, por isso só roda em uma fração sorteada
+    (`taxa_amostragem`, padrão 0); nessas, a captura inclui também `profile.pstats` e
+    `stats.txt`, e a duração registrada inclui o custo do profiler.
+
+    Cada captura é um .zip com esses arquivos e a entrada com os dados pessoais do
+    cliente mascarados (`input.json`, que lista os arquivos presentes). As capturas
+    formam um buffer circular em disco: as mais antigas são removidas.
+    """
+
+    CAPTURE_ID_PATTERN = re.compile(r"^[0-9T]+_[0-9]+ms_[0-9a-f]+$")
+    CAMPOS_SENSIVEIS = ("nome", "cpf_cnpj", "endereco", "telefone")
+
+    def __init__(self, diretorio=None, limite_ms=None, taxa_amostragem=None, max_capturas=None):
+        self.diretorio = diretorio or os.getenv("SLOW_RENDER_DIR", "/tmp/slow_renders")
+        self.limite_ms = limite_ms if limite_ms is not None else float(os.getenv("SLOW_RENDER_THRESHOLD_MS", "10000"))
+        self.taxa_amostragem = taxa_amostragem if taxa_amostragem is not None else float(os.getenv("SLOW_RENDER_SAMPLE_RATE", "0"))
+        self.max_capturas = max_capturas or int(os.getenv("SLOW_RENDER_MAX_DUMPS", "20"))
+        self.intervalo_amostragem_s = float(os.getenv("SLOW_RENDER_STACK_INTERVAL_MS", "10")) / 1000
+
+        # Contadores desde o início do processo
+        self.renderizacoes = 0
+        self.renderizacoes_lentas = 0
+
+    def executar(self, render, dados):
+        """Executa `render(dados)` medindo a duração; renderizações lentas geram captura."""
+        if self.limite_ms <= 0:
+            return render(dados)
+
+        amostrador = AmostradorPilha(threading.get_ident(), self.intervalo_amostragem_s)
+        profiler = cProfile.Profile() if random.random() < self.taxa_amostragem else None
+        inicio = time.perf_counter()
+        amostrador.start()
+        if profiler:
+            profiler.enable()
+        try:
+            resultado = render(dados)
+        finally:
+            if profiler:
+                profiler.disable()
+            duracao_ms = (time.perf_counter() - inicio) * 1000
+            amostrador.parar()
+
+        # Só renderizações concluídas entram nos contadores (ex: tenant inexistente não conta)
+        self.renderizacoes += 1
+        if duracao_ms >= self.limite_ms:
+            self.renderizacoes_lentas += 1
+            print(f"Renderização lenta: {duracao_ms:.0f}ms (limite {self.limite_ms:.0f}ms)")
+            try:
+                self._salvar(amostrador, profiler, dados, duracao_ms)
+            except Exception as e:
+                print(f"Erro ao salvar captura de renderização lenta: {str(e)}")
+        return resultado
+
+    def listar(self):
+        """Lista as capturas existentes, da mais recente para a mais antiga."""
+        capturas = []
+        for captura_id in sorted(self._ids(), reverse=True):
+            timestamp, duracao, _ = captura_id.split("_")
+            capturas.append({
+                "id": captura_id,
+                "timestamp": datetime.strptime(timestamp, "%Y%m%dT%H%M%S").isoformat(),
+                "duracao_ms": int(duracao[:-2]),
+                "tamanho_bytes": os.path.getsize(self._caminho(captura_id))
+            })
+        return capturas
+
+    def caminho_captura(self, captura_id):
+        """Retorna o caminho do .zip da captura, ou None se ela não existir."""
+        if not self.CAPTURE_ID_PATTERN.match(captura_id):
+            return None
+        caminho = self._caminho(captura_id)
+        return caminho if os.path.exists(caminho) else None
+
+    def _salvar(self, amostrador, profiler, dados, duracao_ms):
+        os.makedirs(self.diretorio, exist_ok=True)
+        captura_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}_{int(duracao_ms)}ms_{uuid.uuid4().hex[:8]}"
+
+        arquivos = ["stacks.folded", "input.json"]
+        if profiler:
+            arquivos += ["profile.pstats", "stats.txt"]
+
+        caminho_tmp = self._caminho(captura_id) + ".tmp"
+        with zipfile.ZipFile(caminho_tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("stacks.folded", amostrador.folded())
+            if profiler:
+                resumo = io.StringIO()
+                stats = pstats.Stats(profiler, stream=resumo)
+                stats.sort_stats("cumulative").print_stats(40)
+                # Mesmo formato de Stats.dump_stats(), legível com pstats.Stats("profile.pstats")
+                zf.writestr("profile.pstats", marshal.dumps(stats.stats))
+                zf.writestr("stats.txt", resumo.getvalue())
+            zf.writestr("input.json", json.dumps(
+                {
+                    "duracao_ms": round(duracao_ms, 1),
+                    "perfilado": profiler is not None,
+                    "arquivos": arquivos,
+                    "dados": self._mascarar(dados)
+                },
+                ensure_ascii=False, indent=2, default=str
+            ))
+        os.replace(caminho_tmp, self._caminho(captura_id))
+
+        for antigo in sorted(self._ids())[:-self.max_capturas]:
+            try:
+                os.remove(self._caminho(antigo))
+            except OSError:
+                pass
+
+    def _mascarar(self, dados):
+        """Copia a entrada mascarando dados pessoais, preservando tamanho e estrutura do texto."""
+        mascarado = dict(dados)
+        cliente = dict(dados.get("cliente") or {})
+        for campo in self.CAMPOS_SENSIVEIS:
+            if cliente.get(campo):
+                cliente[campo] = re.sub(
+                    r"\w+",
+                    lambda m: m.group(0) if m.group(0) == "CEP" else re.sub(r"\d", "0", re.sub(r"[^\W\d]", "x", m.group(0))),
+                    str(cliente[campo])
+                )
+        mascarado["cliente"] = cliente
+        return mascarado
+
+    def _ids(self):
+        if not os.path.isdir(self.diretorio):
+            return []
+        return [nome[:-4] for nome in os.listdir(self.diretorio)
+                if nome.endswith(".zip") and self.CAPTURE_ID_PATTERN.match(nome[:-4])]
+
+    def _caminho(self, captura_id):
+        return os.path.join(self.diretorio, f"{captura_id}.zip")
@@ -1,12 +1,16 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import Response, FileResponse
 from datetime import datetime
 import base64
 import traceback
+import hmac
+import os
 
-from app.models.input_data import PropostaInput
+from app.models.input_data import PropostaInput, montar_dados_pdf
 from app.pdf.generator import PDFGenerator
+from app.pdf.tenants import TenantNaoEncontrado
+from app.core.slow_renders import SlowRenderCapture
 
 app = FastAPI(
     title="Solar Proposal PDF Generator",
@@ -26,6 +30,17 @@ app.add_middleware(
 # Inicializar gerador de PDF
 pdf_generator = PDFGenerator()
 
+# Captura de renderizações lentas (perfil cProfile + entrada mascarada)
+slow_renders = SlowRenderCapture()
+
+def verificar_admin(token):
+    """Valida o token dos endpoints administrativos (desabilitados sem ADMIN_TOKEN)."""
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Endpoints administrativos desabilitados")
+    if not token or not hmac.compare_digest(token.encode("utf-8"), admin_token.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Token administrativo inválido")
+
 @app.get("/")
 def read_root():
     return {
@@ -55,24 +70,13 @@ async def criar_proposta(dados: PropostaInput):
     - Retorna: PDF com proposta completa
     """
     try:
-        # Gerar número da proposta
-        numero_proposta = f"{datetime.now().strftime('%d%m%y')}/{datetime.now().year}"
-        
-        # Preparar dados para PDF
-        dados_pdf = {
-            "numero_proposta": numero_proposta,
-            "cliente": {
-                "nome": dados.cliente.nome,
-                "cpf_cnpj": dados.cliente.cpf_cnpj,
-                "endereco": dados.cliente.endereco,
-                "cidade": dados.cliente.cidade,
-                "telefone": dados.cliente.telefone
-            },
-            "dados_completos": dados.dados_completos
-        }
+        # Preparar dados para PDF (inclui o número da proposta)
+        data_emissao = dados.data_emissao or pdf_generator.data_emissao()
+        dados_pdf = montar_dados_pdf(dados, data_emissao)
+        numero_proposta = dados_pdf["numero_proposta"]
         
         # Gerar PDF completo
-        pdf_bytes = pdf_generator.criar_proposta_completa(dados_pdf)
+        pdf_bytes = slow_renders.executar(pdf_generator.criar_proposta_completa, dados_pdf)
         
         # Retornar resposta
         return {
@@ -82,6 +86,8 @@ async def criar_proposta(dados: PropostaInput):
             "pdf_base64": base64.b64encode(pdf_bytes).decode('utf-8')
         }
         
+    except TenantNaoEncontrado as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -98,21 +104,11 @@ async def criar_proposta_pdf_direto(dados: PropostaInput):
     Retorna o PDF diretamente como arquivo
     """
     try:
-        numero_proposta = f"{datetime.now().strftime('%d%m%y')}/{datetime.now().year}"
+        data_emissao = dados.data_emissao or pdf_generator.data_emissao()
+        dados_pdf = montar_dados_pdf(dados, data_emissao)
+        numero_proposta = dados_pdf["numero_proposta"]
         
-        dados_pdf = {
-            "numero_proposta": numero_proposta,
-            "cliente": {
-                "nome": dados.cliente.nome,
-                "cpf_cnpj": dados.cliente.cpf_cnpj,
-                "endereco": dados.cliente.endereco,
-                "cidade": dados.cliente.cidade,
-                "telefone": dados.cliente.telefone
-            },
-            "dados_completos": dados.dados_completos
-        }
-        
-        pdf_bytes = pdf_generator.criar_proposta_completa(dados_pdf)
+        pdf_bytes = slow_renders.executar(pdf_generator.criar_proposta_completa, dados_pdf)
         
         return Response(
             content=pdf_bytes,
@@ -122,9 +118,38 @@ async def criar_proposta_pdf_direto(dados: PropostaInput):
             }
         )
         
+    except TenantNaoEncontrado as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/admin/slow-renders")
+def listar_slow_renders(x_admin_token: str = Header(None)):
+    """
+    Lista as capturas de renderizações lentas (mais recentes primeiro)
+    """
+    verificar_admin(x_admin_token)
+    return {
+        "limite_ms": slow_renders.limite_ms,
+        "taxa_amostragem": slow_renders.taxa_amostragem,
+        "renderizacoes": slow_renders.renderizacoes,
+        "renderizacoes_lentas": slow_renders.renderizacoes_lentas,
+        "capturas": slow_renders.listar()
+    }
+
+@app.get("/admin/slow-renders/{captura_id}")
+def baixar_slow_render(captura_id: str, x_admin_token: str = Header(None)):
+    """
+    Baixa uma captura (.zip com stacks.folded, input.json e, se perfilada, profile.pstats e stats.txt)
+    """
+    verificar_admin(x_admin_token)
+    caminho = slow_renders.caminho_captura(captura_id)
+    if caminho is None:
+        raise HTTPException(status_code=404, detail="Captura não encontrada")
+    return FileResponse(caminho, media_type="application/zip", filename=f"{captura_id}.zip")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
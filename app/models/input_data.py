@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from datetime import date
 
 class ClienteInput(BaseModel):
     nome: str = Field(..., description="Nome completo do cliente")
@@ -18,4 +19,48 @@ class PropostaInput(BaseModel):
         description="Array com todos os dados da planilha (sistema + payback)"
     )
     
+    # Integrador responsável pela proposta (identidade visual e textos)
+    tenant: Optional[str] = Field(
+        None,
+        description="Identificador do integrador (ex: levesol). Se omitido, usa o tenant padrão"
+    )
+    
+    # Perfil de consumo; se omitidos, vêm do índice de municípios pela cidade do cliente
+    concessionaria: Optional[str] = Field(None, description="Concessionária de energia (ex: CPFL Paulista)")
+    tensao: Optional[str] = Field(None, description="Tensão da rede (ex: 127/220V)")
+    radiacao_solar: Optional[float] = Field(None, description="Índice de radiação solar (kWh/m²/dia)")
+    
+    # Data de emissão (número da proposta e data da assinatura); padrão: hoje
+    data_emissao: Optional[date] = Field(
+        None,
+        description="Data de emissão da proposta (YYYY-MM-DD). Fixa o número e a data do PDF"
+    )
+    
+    # PDF linearizado ("fast web view"); se omitido, usa o padrão do servidor (PDF_LINEARIZE)
+    linearizado: Optional[bool] = Field(
+        None,
+        description="Gera o PDF linearizado, exibindo a capa antes do download terminar"
+    )
+    
     # O investimento será extraído automaticamente de "Preço do Sistema Dimensionado"
+
+
+def montar_dados_pdf(dados: PropostaInput, data_emissao):
+    """Monta o dicionário esperado por PDFGenerator.criar_proposta_completa a partir da entrada."""
+    return {
+        "numero_proposta": f"{data_emissao.strftime('%d%m%y')}/{data_emissao.year}",
+        "data_emissao": data_emissao,
+        "cliente": {
+            "nome": dados.cliente.nome,
+            "cpf_cnpj": dados.cliente.cpf_cnpj,
+            "endereco": dados.cliente.endereco,
+            "cidade": dados.cliente.cidade,
+            "telefone": dados.cliente.telefone
+        },
+        "dados_completos": dados.dados_completos,
+        "concessionaria": dados.concessionaria,
+        "tensao": dados.tensao,
+        "radiacao_solar": dados.radiacao_solar,
+        "tenant": dados.tenant,
+        "linearizado": dados.linearizado
+    }
@@ -0,0 +1,202 @@
+"""
+Geração de propostas em lote, sem passar pela API.
+
+Lê registros `PropostaInput` de um arquivo JSONL (ou da entrada padrão) e gera os PDFs
+em paralelo, um processo por núcleo. Cada resultado é registrado em `manifest.jsonl` no
+diretório de saída; ao rodar de novo, os registros já gerados são pulados. A data de
+emissão do lote fica em `lote.json` e é reaproveitada ao retomar, mesmo em outro dia.
+
+Uso:
+    python -m app.pdf.batch propostas.jsonl -o saida/
+    cat propostas.jsonl | python -m app.pdf.batch -o saida/ --workers 8
+"""
+from multiprocessing import Pool
+from datetime import date
+import argparse
+import hashlib
+import json
+import time
+import sys
+import os
+
+from app.models.input_data import PropostaInput, montar_dados_pdf
+from app.pdf.generator import PDFGenerator
+
+MANIFEST = "manifest.jsonl"
+LOTE = "lote.json"
+
+# Um gerador por processo (tenants e imagens ficam em cache entre as propostas)
+_pdf_generator = None
+_output_dir = None
+_data_emissao = None
+
+
+def _init_worker(output_dir, data_emissao):
+    global _pdf_generator, _output_dir, _data_emissao
+    _pdf_generator = PDFGenerator()
+    _output_dir = output_dir
+    _data_emissao = data_emissao
+
+
+def _chave(linha, data_emissao):
+    """
+    Identificador estável do registro, usado como nome do PDF e para retomar o lote.
+
+    Inclui a data de emissão efetiva (a do registro ou a do lote): rodar de novo com
+    outra `--data-emissao` gera novos PDFs em vez de reaproveitar os da data anterior.
+    """
+    try:
+        data_registro = json.loads(linha).get("data_emissao")
+    except (ValueError, AttributeError):
+        data_registro = None  # registro inválido; o erro é reportado ao gerar
+    efetiva = data_registro or data_emissao.isoformat()
+    return hashlib.sha256(f"{linha.strip()}|{efetiva}".encode("utf-8")).hexdigest()[:16]
+
+
+def _gerar(tarefa):
+    """Gera o PDF de um registro e retorna a entrada do manifesto."""
+    numero_linha, linha, chave = tarefa
+    resultado = {"linha": numero_linha, "chave": chave, "status": "ok"}
+    inicio = time.perf_counter()
+    try:
+        dados = PropostaInput.model_validate_json(linha)
+        dados_pdf = montar_dados_pdf(dados, dados.data_emissao or _data_emissao)
+        numero_proposta = dados_pdf["numero_proposta"]
+        pdf_bytes = _pdf_generator.criar_proposta_completa(dados_pdf)
+
+        arquivo = f"{chave}.pdf"
+        caminho = os.path.join(_output_dir, arquivo)
+        caminho_tmp = f"{caminho}.{os.getpid()}.tmp"
+        with open(caminho_tmp, "wb") as f:
+            f.write(pdf_bytes)
+        os.replace(caminho_tmp, caminho)
+
+        resultado.update({"numero_proposta": numero_proposta, "cliente": dados.cliente.nome, "arquivo": arquivo})
+    except Exception as e:
+        resultado.update({"status": "erro", "erro": f"{type(e).__name__}: {str(e)}"})
+    resultado["duracao_ms"] = round((time.perf_counter() - inicio) * 1000, 1)
+    return resultado
+
+
+def _ler_registros(entrada):
+    """Lê as linhas não vazias do JSONL como pares (número da linha, conteúdo)."""
+    if entrada in (None, "-"):
+        linhas = sys.stdin.read().splitlines()
+    else:
+        with open(entrada, "r", encoding="utf-8") as f:
+            linhas = f.read().splitlines()
+    return [(i, linha) for i, linha in enumerate(linhas, start=1) if linha.strip()]
+
+
+def _chaves_concluidas(output_dir):
+    """Chaves já geradas com sucesso em execuções anteriores (PDF presente no disco)."""
+    concluidas = set()
+    manifest_path = os.path.join(output_dir, MANIFEST)
+    if not os.path.exists(manifest_path):
+        return concluidas
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for linha in f:
+            try:
+                entrada = json.loads(linha)
+            except ValueError:
+                continue  # linha truncada por uma interrupção
+            if entrada.get("status") == "ok" and os.path.exists(os.path.join(output_dir, entrada["arquivo"])):
+                concluidas.add(entrada["chave"])
+    return concluidas
+
+
+def _data_do_lote(output_dir, data_explicita):
+    """
+    Data de emissão do lote: a informada em `--data-emissao` ou a gravada na primeira
+    execução. Sem isso, retomar depois da meia-noite mudaria todas as chaves.
+    """
+    lote_path = os.path.join(output_dir, LOTE)
+    if data_explicita is None and os.path.exists(lote_path):
+        with open(lote_path, "r", encoding="utf-8") as f:
+            return date.fromisoformat(json.load(f)["data_emissao"])
+
+    data_emissao = data_explicita or date.today()
+    with open(lote_path, "w", encoding="utf-8") as f:
+        json.dump({"data_emissao": data_emissao.isoformat()}, f)
+    return data_emissao
+
+
+def _inteiro_positivo(valor):
+    numero = int(valor)
+    if numero < 1:
+        raise argparse.ArgumentTypeError(f"deve ser um inteiro maior ou igual a 1: {valor}")
+    return numero
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.pdf.batch", description="Gera propostas em PDF a partir de um arquivo JSONL.")
+    parser.add_argument("entrada", nargs="?", default="-", help="Arquivo JSONL com registros PropostaInput ('-' para stdin)")
+    parser.add_argument("-o", "--output", default="propostas", help="Diretório de saída dos PDFs e do manifesto")
+    parser.add_argument("-w", "--workers", type=_inteiro_positivo, default=os.cpu_count(), help="Número de processos (padrão: núcleos da máquina)")
+    parser.add_argument("--chunksize", type=_inteiro_positivo, default=4, help="Registros enviados por vez a cada processo")
+    parser.add_argument("--data-emissao", type=date.fromisoformat, default=None,
+                        help="Data de emissão (YYYY-MM-DD) para registros sem data_emissao "
+                             "(padrão: a do lote em andamento no diretório de saída, ou hoje)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output, exist_ok=True)
+    # Resolvida uma vez: o lote inteiro usa a mesma data, mesmo se cruzar a meia-noite
+    data_emissao = _data_do_lote(args.output, args.data_emissao)
+    registros = [(numero, linha, _chave(linha, data_emissao)) for numero, linha in _ler_registros(args.entrada)]
+    concluidas = _chaves_concluidas(args.output)
+
+    # Linhas repetidas geram o mesmo PDF: só a primeira é enviada aos processos
+    pendentes, duplicados, primeira_linha = [], [], {}
+    for numero, linha, chave in registros:
+        if chave in concluidas:
+            continue
+        if chave in primeira_linha:
+            duplicados.append({"linha": numero, "chave": chave, "status": "duplicado", "linha_original": primeira_linha[chave]})
+        else:
+            primeira_linha[chave] = numero
+            pendentes.append((numero, linha, chave))
+    total = len(pendentes)
+    print(f"{len(registros)} registros, {len(registros) - total - len(duplicados)} já gerados, "
+          f"{len(duplicados)} duplicados, {total} pendentes ({args.workers} processos)")
+
+    with open(os.path.join(args.output, MANIFEST), "a", encoding="utf-8") as manifest:
+        for duplicado in duplicados:
+            manifest.write(json.dumps(duplicado) + "\n")
+    if not pendentes:
+        return 0
+
+    gerados = erros = 0
+    inicio = ultimo_relatorio = time.perf_counter()
+    pool = Pool(args.workers, initializer=_init_worker, initargs=(args.output, data_emissao))
+    try:
+        with open(os.path.join(args.output, MANIFEST), "a", encoding="utf-8") as manifest:
+            for resultado in pool.imap_unordered(_gerar, pendentes, chunksize=args.chunksize):
+                manifest.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+                manifest.flush()
+                if resultado["status"] == "ok":
+                    gerados += 1
+                else:
+                    erros += 1
+                    print(f"Erro na linha {resultado['linha']}: {resultado['erro']}", file=sys.stderr)
+
+                agora = time.perf_counter()
+                feitos = gerados + erros
+                if agora - ultimo_relatorio >= 2 or feitos == total:
+                    ultimo_relatorio = agora
+                    taxa = feitos / (agora - inicio)
+                    restante = (total - feitos) / taxa if taxa else 0
+                    print(f"[{feitos}/{total}] {taxa:.2f} propostas/s, {erros} erros, ~{restante:.0f}s restantes")
+    except KeyboardInterrupt:
+        print(f"\nInterrompido: {gerados} gerados nesta execução. Rode novamente para continuar.", file=sys.stderr)
+        return 130
+    finally:
+        pool.terminate()
+        pool.join()
+
+    duracao = time.perf_counter() - inicio
+    print(f"Concluído: {gerados} gerados, {erros} erros em {duracao:.1f}s ({(gerados + erros) / duracao:.2f} propostas/s)")
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
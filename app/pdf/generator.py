@@ -10,18 +10,38 @@ import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')
 import numpy as np
+import pikepdf
 from io import BytesIO
 import base64
 from datetime import datetime
 import re
 import os
 
+from app.pdf.tenants import TenantRegistry
+from app.core.localidades import IndiceLocalidades
+
 class PDFGenerator:
-    def __init__(self):
-        # --- CAMINHOS E ESTILOS ---
-        self.assets_path = "app/pdf/assets/"
+    def __init__(self, deterministico=None, relogio=None, linearizado=None):
+        # --- ESTILOS E TENANTS ---
         self.styles = getSampleStyleSheet()
         self._setup_styles_and_palette()
+        self.tenants = TenantRegistry(estilo_padrao=self._estilo_padrao())
+        self.localidades = IndiceLocalidades()
+        self.localidades.abrir()  # índice inválido falha na inicialização, não na primeira proposta
+
+        # --- MODO DETERMINÍSTICO ---
+        # Sem timestamp/ID aleatório nos metadados e com a data vinda do relógio
+        # injetado (ou de dados["data_emissao"]): mesma entrada, mesmos bytes.
+        if deterministico is None:
+            deterministico = os.getenv("PDF_DETERMINISTIC", "false").lower() in ("1", "true", "yes")
+        self.deterministico = deterministico
+        self.relogio = relogio or datetime.now
+
+        # --- PDF LINEARIZADO ("fast web view") ---
+        # Padrão para todas as propostas; cada requisição pode sobrescrever com dados["linearizado"]
+        if linearizado is None:
+            linearizado = os.getenv("PDF_LINEARIZE", "false").lower() in ("1", "true", "yes")
+        self.linearizado = linearizado
 
     def _setup_styles_and_palette(self):
         """Define a paleta de cores, fontes e espaçamentos padrão."""
@@ -61,43 +81,64 @@ class PDFGenerator:
         self.SPACE_SMALL = 15
         self.LINE_SPACING = 18
 
-    def _draw_header_logo(self, c, height):
+    def _estilo_padrao(self):
+        """Retorna a paleta, fontes e espaçamentos padrão, usados como base pelos tenants."""
+        return {chave: valor for chave, valor in vars(self).items() if chave.isupper()}
+
+    def linearizar(self, pdf_bytes):
+        """
+        Reescreve o PDF linearizado: tabelas de hint e objetos da capa no início do
+        arquivo, para o visualizador exibir a primeira página antes do download terminar.
+        """
+        saida = BytesIO()
+        with pikepdf.open(BytesIO(pdf_bytes)) as pdf:
+            # Streams copiados como estão: decodificar e recomprimir as imagens dobraria o tempo
+            pdf.save(saida, linearize=True, deterministic_id=self.deterministico,
+                     compress_streams=False, stream_decode_level=pikepdf.StreamDecodeLevel.none)
+        return saida.getvalue()
+
+    def data_emissao(self, dados=None):
+        """Data de emissão da proposta: a informada nos dados ou a do relógio do gerador."""
+        if dados and dados.get("data_emissao"):
+            return dados["data_emissao"]
+        return self.relogio()
+
+    def _draw_header_logo(self, c, height, tenant):
         """Desenha o logo no canto superior esquerdo."""
         try:
-            logo_path = os.path.join(self.assets_path, "levesol_logo.png")
-            if os.path.exists(logo_path):
-                c.drawImage(logo_path, 40, height - 70, width=150, 
+            logo = tenant.imagem("logo")
+            if logo is not None:
+                c.drawImage(logo, 40, height - 70, width=150, 
                             preserveAspectRatio=True, mask='auto')
         except:
             pass
 
-    def _draw_footer(self, c, width):
+    def _draw_footer(self, c, width, tenant):
         """Desenha o rodapé padrão em uma página."""
         c.saveState()
-        c.setFont(self.FONT_NORMAL, self.FONT_SIZE_FOOTER)
-        c.setFillColor(self.COLOR_TEXT_LIGHT)
-        c.drawCentredString(width/2, 45, "LEVESOL LTDA CNPJ 44.075.186/0001-13")
-        c.drawCentredString(width/2, 33, "Avenida Nossa Senhora de Fátima, 11-15, Jardim América, CEP 17017-337, Bauru")
-        c.drawCentredString(width/2, 21, "Contato: (14) 99893-7738 | contato@levesol.com.br | www.levesol.com.br")
+        c.setFont(tenant.FONT_NORMAL, tenant.FONT_SIZE_FOOTER)
+        c.setFillColor(tenant.COLOR_TEXT_LIGHT)
+        for i, linha in enumerate(tenant.rodape):
+            c.drawCentredString(width/2, 45 - i * 12, linha)
         c.restoreState()
 
-    def _draw_section_header(self, c, y_pos, title, width):
+    def _draw_section_header(self, c, y_pos, title, width, tenant):
         """Desenha um cabeçalho de seção padronizado."""
         c.saveState()
-        c.setFillColor(self.COLOR_PRIMARY_BLUE)
+        c.setFillColor(tenant.COLOR_PRIMARY_BLUE)
         c.rect(50, y_pos, width - 100, 28, fill=1, stroke=0)
-        c.setFillColor(self.COLOR_WHITE)
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_BODY_LARGE)
+        c.setFillColor(tenant.COLOR_WHITE)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_BODY_LARGE)
         c.drawString(65, y_pos + 9, title.upper())
         c.restoreState()
         return y_pos - 28
 
-    def desenhar_fundo_interno(self, c, width, height):
+    def desenhar_fundo_interno(self, c, width, height, tenant):
         """Adiciona o fundo padrão nas páginas internas"""
         try:
-            bg_path = os.path.join(self.assets_path, "background_interno.jpg")
-            if os.path.exists(bg_path):
-                c.drawImage(bg_path, 0, 0, width=width, height=height, preserveAspectRatio=False, mask='auto')
+            fundo = tenant.imagem("fundo_interno")
+            if fundo is not None:
+                c.drawImage(fundo, 0, 0, width=width, height=height, preserveAspectRatio=False, mask='auto')
         except:
             pass
     
@@ -182,17 +223,18 @@ class PDFGenerator:
                 
         return dados_sistema, dados_payback
     
-    def gerar_grafico_payback(self, dados_payback):
+    def gerar_grafico_payback(self, dados_payback, tenant=None):
         """Gera o gráfico de payback com a nova paleta de cores."""
+        estilo = tenant or self
         anos = [item["ano"] for item in dados_payback]
         amortizacao = [item["amortizacao"] for item in dados_payback]
         
         fig, ax = plt.subplots(figsize=(10, 5))
-        cores = [self.COLOR_RED_NEGATIVE_HEX if valor < 0 else self.COLOR_ACCENT_GOLD_HEX for valor in amortizacao]
+        cores = [estilo.COLOR_RED_NEGATIVE_HEX if valor < 0 else estilo.COLOR_ACCENT_GOLD_HEX for valor in amortizacao]
         
         ax.bar(anos, amortizacao, color=cores, width=0.7, edgecolor='none')
         
-        ax.set_title('Análise de Retorno (Payback)', fontsize=16, fontweight='bold', pad=20, color=self.COLOR_TEXT_HEX)
+        ax.set_title('Análise de Retorno (Payback)', fontsize=16, fontweight='bold', pad=20, color=estilo.COLOR_TEXT_HEX)
         ax.grid(True, axis='y', alpha=0.4, linestyle='--', linewidth=0.7)
         ax.set_axisbelow(True)
         
@@ -211,7 +253,7 @@ class PDFGenerator:
         ax.tick_params(axis='x', labelsize=9)
         ax.tick_params(axis='y', labelsize=9)
 
-        ax.axhline(y=0, color=self.COLOR_TEXT_HEX, linewidth=1, alpha=0.7)
+        ax.axhline(y=0, color=estilo.COLOR_TEXT_HEX, linewidth=1, alpha=0.7)
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
         ax.spines['left'].set_color('#dddddd')
@@ -248,41 +290,42 @@ class PDFGenerator:
         dados_sistema, dados_payback = self.extrair_dados(dados["dados_completos"])
         payback_anos, payback_meses = self.calcular_payback(dados_payback)
         economia_total = dados_payback[-1]["amortizacao"] if dados_payback else 0
+        tenant = self.tenants.obter(dados.get("tenant"))
         
-        c = canvas.Canvas(buffer, pagesize=A4)
+        c = canvas.Canvas(buffer, pagesize=A4, invariant=int(self.deterministico))
         width, height = A4
 
         # ========== PÁGINA 1: CAPA ==========
         try:
-            bg_path = os.path.join(self.assets_path, "capa_background.png")
-            if os.path.exists(bg_path):
-                c.drawImage(bg_path, 0, 0, width=width, height=height, preserveAspectRatio=False)
+            capa = tenant.imagem("capa")
+            if capa is not None:
+                c.drawImage(capa, 0, 0, width=width, height=height, preserveAspectRatio=False)
         except:
-            c.setFillColor(self.COLOR_WHITE)
+            c.setFillColor(tenant.COLOR_WHITE)
             c.rect(0, 0, width, height, fill=1)
         
-        c.setFillColor(self.COLOR_PRIMARY_BLUE)
-        c.setFont(self.FONT_BOLD, 24)
+        c.setFillColor(tenant.COLOR_PRIMARY_BLUE)
+        c.setFont(tenant.FONT_BOLD, 24)
         c.drawCentredString(width/2, height/2 + 10, dados['cliente']['nome'].upper())
-        c.setFont(self.FONT_NORMAL, 18)
+        c.setFont(tenant.FONT_NORMAL, 18)
         c.drawCentredString(width/2, height/2 - 20, f"PROPOSTA {dados['numero_proposta']}")
         c.showPage()
         
         # ========== PÁGINA 2: DADOS DO SISTEMA ==========
-        self.desenhar_fundo_interno(c, width, height)
-        self._draw_header_logo(c, height)
-        c.setFillColor(self.COLOR_PRIMARY_BLUE)
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_TITLE)
+        self.desenhar_fundo_interno(c, width, height, tenant)
+        self._draw_header_logo(c, height, tenant)
+        c.setFillColor(tenant.COLOR_PRIMARY_BLUE)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_TITLE)
         c.drawCentredString(width/2, height - 80, "Proposta Comercial")
-        c.setFont(self.FONT_NORMAL, self.FONT_SIZE_SUBTITLE)
+        c.setFont(tenant.FONT_NORMAL, tenant.FONT_SIZE_SUBTITLE)
         c.drawCentredString(width/2, height - 105, "Sistema Fotovoltaico On-grid")
         
         y_pos = height - 160
-        y_pos = self._draw_section_header(c, y_pos, "Dados da Proposta", width)
+        y_pos = self._draw_section_header(c, y_pos, "Dados da Proposta", width, tenant)
         y_pos -= 20
 
-        c.setFont(self.FONT_NORMAL, self.FONT_SIZE_BODY)
-        c.setFillColor(self.COLOR_TEXT)
+        c.setFont(tenant.FONT_NORMAL, tenant.FONT_SIZE_BODY)
+        c.setFillColor(tenant.COLOR_TEXT)
         
         dados_cliente = [("CLIENTE", dados['cliente']['nome'].upper()), ("CPF/CNPJ", dados['cliente']['cpf_cnpj']),
                          ("ENDEREÇO", dados['cliente']['endereco']), ("CIDADE", dados['cliente']['cidade'])]
@@ -326,20 +369,26 @@ class PDFGenerator:
                     linhas.append(texto)
                 
                 for i, linha in enumerate(linhas):
-                    c.drawString(220, y_pos - (i * self.LINE_SPACING), linha)
+                    c.drawString(220, y_pos - (i * tenant.LINE_SPACING), linha)
                 
-                y_pos -= self.LINE_SPACING * len(linhas)
+                y_pos -= tenant.LINE_SPACING * len(linhas)
             else:
                 c.drawString(220, y_pos, str(valor))
-                y_pos -= self.LINE_SPACING
+                y_pos -= tenant.LINE_SPACING
         
         y_pos -= 30
-        y_pos = self._draw_section_header(c, y_pos, "Perfil de Consumo do Cliente", width)
+        y_pos = self._draw_section_header(c, y_pos, "Perfil de Consumo do Cliente", width, tenant)
         y_pos -= 20
         
+        # Dados informados na entrada têm prioridade sobre o índice de municípios
+        localidade = self.localidades.buscar(dados['cliente']['cidade']) or {}
+        concessionaria = dados.get('concessionaria') or localidade.get('concessionaria', 'CPFL')
+        tensao = dados.get('tensao') or localidade.get('tensao', '220V')
+        radiacao_solar = dados.get('radiacao_solar') or localidade.get('radiacao_solar', 5.0)
+
         dados_consumo = [
-            ("CONCESSIONÁRIA", "CPFL"), ("TIPO DE FORNECIMENTO", dados_sistema.get('tipo_fornecimento', 'N/A')),
-            ("TENSÃO", "220V"), ("ÍNDICE DE RADIAÇÃO (kWh/m²)", "5.0"),
+            ("CONCESSIONÁRIA", concessionaria), ("TIPO DE FORNECIMENTO", dados_sistema.get('tipo_fornecimento', 'N/A')),
+            ("TENSÃO", tensao), ("ÍNDICE DE RADIAÇÃO (kWh/m²)", f"{radiacao_solar:.2f}"),
             ("CONSUMO MÉDIO ATUAL (kWh)", f"{dados_sistema.get('consumo_atual', 0):.0f}"),
             ("GERAÇÃO MÉDIA MENSAL (kWh)", f"{dados_sistema.get('geracao_mensal', 0):.0f}"),
             ("VALOR MÉDIO MENSAL DA CONTA", f"R$ {dados_sistema.get('conta_antes', 0):,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'))
@@ -347,10 +396,10 @@ class PDFGenerator:
         for label, valor in dados_consumo:
             c.drawString(65, y_pos, f"{label}:")
             c.drawString(320, y_pos, str(valor))
-            y_pos -= self.LINE_SPACING
+            y_pos -= tenant.LINE_SPACING
             
         y_pos -= 30
-        y_pos = self._draw_section_header(c, y_pos, "Sistema Fotovoltaico Proposto", width)
+        y_pos = self._draw_section_header(c, y_pos, "Sistema Fotovoltaico Proposto", width, tenant)
         y_pos -= 20
 
         dados_sfv = [
@@ -361,16 +410,16 @@ class PDFGenerator:
         for label, valor in dados_sfv:
             c.drawString(65, y_pos, f"{label}:")
             c.drawString(320, y_pos, str(valor))
-            y_pos -= self.LINE_SPACING
+            y_pos -= tenant.LINE_SPACING
 
-        self._draw_footer(c, width)
+        self._draw_footer(c, width, tenant)
         c.showPage()
         
         # ========== PÁGINA 3: SERVIÇOS E GARANTIAS ==========
-        self.desenhar_fundo_interno(c, width, height)
-        self._draw_header_logo(c, height)
-        c.setFillColor(self.COLOR_PRIMARY_BLUE)
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_TITLE)
+        self.desenhar_fundo_interno(c, width, height, tenant)
+        self._draw_header_logo(c, height, tenant)
+        c.setFillColor(tenant.COLOR_PRIMARY_BLUE)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_TITLE)
         c.drawCentredString(width/2, height - 80, "Equipamentos e Serviços Inclusos")
 
         y_pos = height - 130
@@ -385,78 +434,78 @@ class PDFGenerator:
             texto_inversor = f"{potencia_inversor}KW"
         
         servicos = [
-            (f"{num_modulos} MÓDULOS FOTOVOLTAICOS RISEN / HONOR / SUNX 700W",), 
-            (f"1 INVERSOR SOLAR DEYE / GROWATT / SOLIS {texto_inversor}",),
+            (f"{num_modulos} MÓDULOS FOTOVOLTAICOS {tenant.marcas_modulos}",), 
+            (f"1 INVERSOR SOLAR {tenant.marcas_inversores} {texto_inversor}",),
             ("ESTRUTURA COMPLETA PARA MONTAGEM",), ("PROTEÇÃO E CABEAMENTO CA/CC",), ("HOMOLOGAÇÃO",),
             ("INSTALAÇÃO E MÃO DE OBRA",), ("MONITORAMENTO",), ("FRETE",)
         ]
 
         table = Table(servicos, colWidths=[width - 120])
         table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), self.COLOR_WHITE),
-            ('ROWBACKGROUNDS', (0, 0), (-1, -1), [self.COLOR_WHITE, self.COLOR_LIGHT_GRAY_BG]),
-            ('TEXTCOLOR', (0, 0), (-1, -1), self.COLOR_TEXT),
+            ('BACKGROUND', (0, 0), (-1, -1), tenant.COLOR_WHITE),
+            ('ROWBACKGROUNDS', (0, 0), (-1, -1), [tenant.COLOR_WHITE, tenant.COLOR_LIGHT_GRAY_BG]),
+            ('TEXTCOLOR', (0, 0), (-1, -1), tenant.COLOR_TEXT),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, -1), self.FONT_NORMAL),
-            ('FONTSIZE', (0, 0), (-1, -1), self.FONT_SIZE_BODY),
-            ('INNERGRID', (0, 0), (-1, -1), 0.25, self.COLOR_BORDER),
-            ('BOX', (0, 0), (-1, -1), 1, self.COLOR_BORDER),
+            ('FONTNAME', (0, 0), (-1, -1), tenant.FONT_NORMAL),
+            ('FONTSIZE', (0, 0), (-1, -1), tenant.FONT_SIZE_BODY),
+            ('INNERGRID', (0, 0), (-1, -1), 0.25, tenant.COLOR_BORDER),
+            ('BOX', (0, 0), (-1, -1), 1, tenant.COLOR_BORDER),
             ('LEFTPADDING', (0,0), (-1,-1), 20), ('RIGHTPADDING', (0,0), (-1,-1), 20),
             ('TOPPADDING', (0,0), (-1,-1), 12), ('BOTTOMPADDING', (0,0), (-1,-1), 12),
         ]))
         table.wrapOn(c, width - 100, y_pos)
         table.drawOn(c, 60, y_pos - table._height)
-        y_pos -= table._height + self.SPACE_LARGE
+        y_pos -= table._height + tenant.SPACE_LARGE
 
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_SUBTITLE)
-        c.setFillColor(self.COLOR_PRIMARY_BLUE)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_SUBTITLE)
+        c.setFillColor(tenant.COLOR_PRIMARY_BLUE)
         c.drawCentredString(width/2, y_pos, "Garantia dos Equipamentos")
-        y_pos -= self.SPACE_MEDIUM
+        y_pos -= tenant.SPACE_MEDIUM
 
-        c.setFont(self.FONT_NORMAL, self.FONT_SIZE_BODY)
-        c.setFillColor(self.COLOR_TEXT)
+        c.setFont(tenant.FONT_NORMAL, tenant.FONT_SIZE_BODY)
+        c.setFillColor(tenant.COLOR_TEXT)
         c.drawCentredString(width/2, y_pos, "Inversores: Garantia de 10 anos contra defeitos de fabricação.")
-        y_pos -= self.LINE_SPACING
+        y_pos -= tenant.LINE_SPACING
         c.drawCentredString(width/2, y_pos, "Módulos: Garantia de 12 anos (produto) e 30 anos (eficiência de geração).")
         
         try:
-            logos_path = os.path.join(self.assets_path, "logos_fornecedores.png")
-            if os.path.exists(logos_path):
-                c.drawImage(logos_path, 60, y_pos - 250, width=width-120, height=300, preserveAspectRatio=True, mask='auto')
+            logos = tenant.imagem("logos_fornecedores")
+            if logos is not None:
+                c.drawImage(logos, 60, y_pos - 250, width=width-120, height=300, preserveAspectRatio=True, mask='auto')
         except:
             pass
         
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_BODY_LARGE)
-        c.setFillColor(self.COLOR_PRIMARY_BLUE)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_BODY_LARGE)
+        c.setFillColor(tenant.COLOR_PRIMARY_BLUE)
         c.drawCentredString(width/2, 100, "GARANTIA DE 1 ANO DA INSTALAÇÃO")
         
-        self._draw_footer(c, width)
+        self._draw_footer(c, width, tenant)
         c.showPage()
         
         # ========== PÁGINA 4: ANÁLISE FINANCEIRA (GRÁFICO) ==========
-        self.desenhar_fundo_interno(c, width, height)
-        self._draw_header_logo(c, height)
-        c.setFillColor(self.COLOR_PRIMARY_BLUE)
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_TITLE)
+        self.desenhar_fundo_interno(c, width, height, tenant)
+        self._draw_header_logo(c, height, tenant)
+        c.setFillColor(tenant.COLOR_PRIMARY_BLUE)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_TITLE)
         c.drawCentredString(width/2, height - 80, "Análise Financeira")
 
         y_pos = height - 160
-        c.setFillColor(self.COLOR_TEXT)
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_SUBTITLE)
+        c.setFillColor(tenant.COLOR_TEXT)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_SUBTITLE)
         c.drawCentredString(width/2, y_pos, "Investimento Total Proposto")
         y_pos -= 30
-        c.setFillColor(self.COLOR_SUCCESS_GREEN)
-        c.setFont(self.FONT_BOLD, 28)
+        c.setFillColor(tenant.COLOR_SUCCESS_GREEN)
+        c.setFont(tenant.FONT_BOLD, 28)
         investimento_fmt = f"R$ {dados_sistema.get('investimento', 0):,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
         c.drawCentredString(width/2, y_pos, investimento_fmt)
         y_pos -= 25
-        c.setFont(self.FONT_NORMAL, self.FONT_SIZE_BODY_SMALL)
-        c.setFillColor(self.COLOR_TEXT_LIGHT)
+        c.setFont(tenant.FONT_NORMAL, tenant.FONT_SIZE_BODY_SMALL)
+        c.setFillColor(tenant.COLOR_TEXT_LIGHT)
         c.drawCentredString(width/2, y_pos, "*Valor inicial, sujeito a alterações após visita técnica.")
 
         if dados_payback:
-            grafico_buffer = self.gerar_grafico_payback(dados_payback)
+            grafico_buffer = self.gerar_grafico_payback(dados_payback, tenant)
             img = ImageReader(grafico_buffer)
             
             grafico_width = width - 80
@@ -466,34 +515,34 @@ class PDFGenerator:
 
             c.drawImage(img, x_pos, y_pos_grafico, width=grafico_width, height=grafico_height, preserveAspectRatio=True)
 
-        self._draw_footer(c, width)
+        self._draw_footer(c, width, tenant)
         c.showPage()
         
         # ========== PÁGINA 5: RETORNO DO INVESTIMENTO (RESUMO E SALDO) ==========
-        self.desenhar_fundo_interno(c, width, height)
-        self._draw_header_logo(c, height)
-        c.setFillColor(self.COLOR_PRIMARY_BLUE)
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_TITLE)
+        self.desenhar_fundo_interno(c, width, height, tenant)
+        self._draw_header_logo(c, height, tenant)
+        c.setFillColor(tenant.COLOR_PRIMARY_BLUE)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_TITLE)
         c.drawCentredString(width/2, height - 80, "Retorno do Investimento (Payback)")
         
         y_pos = height - 150
-        c.setFillColor(self.COLOR_TEXT)
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_SUBTITLE)
+        c.setFillColor(tenant.COLOR_TEXT)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_SUBTITLE)
         c.drawCentredString(width/2, y_pos, "Tempo Estimado para Retorno")
         y_pos -= 30
-        c.setFillColor(self.COLOR_SUCCESS_GREEN)
-        c.setFont(self.FONT_BOLD, 28)
+        c.setFillColor(tenant.COLOR_SUCCESS_GREEN)
+        c.setFont(tenant.FONT_BOLD, 28)
         c.drawCentredString(width/2, y_pos, f"{payback_anos} anos e {payback_meses} meses")
 
-        y_pos -= self.SPACE_LARGE
-        c.setFillColor(self.COLOR_TEXT)
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_SUBTITLE)
+        y_pos -= tenant.SPACE_LARGE
+        c.setFillColor(tenant.COLOR_TEXT)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_SUBTITLE)
         c.drawCentredString(width/2, y_pos, "Projeção de Caixa Acumulado (21 anos)")
         y_pos -= 30
-        c.setFillColor(self.COLOR_SUCCESS_GREEN)
-        c.setFont(self.FONT_BOLD, 28)
+        c.setFillColor(tenant.COLOR_SUCCESS_GREEN)
+        c.setFont(tenant.FONT_BOLD, 28)
         c.drawCentredString(width/2, y_pos, f"R$ {economia_total:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.'))
-        y_pos -= self.SPACE_MEDIUM
+        y_pos -= tenant.SPACE_MEDIUM
 
         table_data = [("Ano", "Saldo Acumulado")]
         dynamic_styles = []
@@ -501,18 +550,18 @@ class PDFGenerator:
             saldo = item['amortizacao']
             table_data.append( (str(item['ano']), f"R$ {saldo:,.2f}") )
             if saldo < 0:
-                dynamic_styles.append(('TEXTCOLOR', (1, i + 1), (1, i + 1), self.COLOR_RED_NEGATIVE))
+                dynamic_styles.append(('TEXTCOLOR', (1, i + 1), (1, i + 1), tenant.COLOR_RED_NEGATIVE))
 
         table = Table(table_data, colWidths=[150, 250])
         style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.COLOR_PRIMARY_BLUE),
-            ('TEXTCOLOR', (0, 0), (-1, 0), self.COLOR_WHITE),
+            ('BACKGROUND', (0, 0), (-1, 0), tenant.COLOR_PRIMARY_BLUE),
+            ('TEXTCOLOR', (0, 0), (-1, 0), tenant.COLOR_WHITE),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, 0), self.FONT_BOLD),
-            ('FONTNAME', (0, 1), (-1, -1), self.FONT_NORMAL),
-            ('GRID', (0, 0), (-1, -1), 1, self.COLOR_BORDER),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [self.COLOR_WHITE, self.COLOR_LIGHT_GRAY_BG]),
+            ('FONTNAME', (0, 0), (-1, 0), tenant.FONT_BOLD),
+            ('FONTNAME', (0, 1), (-1, -1), tenant.FONT_NORMAL),
+            ('GRID', (0, 0), (-1, -1), 1, tenant.COLOR_BORDER),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [tenant.COLOR_WHITE, tenant.COLOR_LIGHT_GRAY_BG]),
         ])
         for s in dynamic_styles:
             style.add(*s)
@@ -521,14 +570,14 @@ class PDFGenerator:
         table.wrapOn(c, width - 100, y_pos)
         table.drawOn(c, (width-400)/2, y_pos - table._height)
         
-        self._draw_footer(c, width)
+        self._draw_footer(c, width, tenant)
         c.showPage()
         
         # ========== PÁGINA 6: ECONOMIA DE ENERGIA (TABELA MENSAL) ==========
-        self.desenhar_fundo_interno(c, width, height)
-        self._draw_header_logo(c, height)
-        c.setFillColor(self.COLOR_PRIMARY_BLUE)
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_TITLE)
+        self.desenhar_fundo_interno(c, width, height, tenant)
+        self._draw_header_logo(c, height, tenant)
+        c.setFillColor(tenant.COLOR_PRIMARY_BLUE)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_TITLE)
         c.drawCentredString(width/2, height - 80, "Projeção de Economia Mensal")
         
         y_pos = height - 220
@@ -539,42 +588,42 @@ class PDFGenerator:
 
         table = Table(table_data, colWidths=[150, 250])
         table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), self.COLOR_PRIMARY_BLUE),
-            ('TEXTCOLOR', (0, 0), (-1, 0), self.COLOR_WHITE),
+            ('BACKGROUND', (0, 0), (-1, 0), tenant.COLOR_PRIMARY_BLUE),
+            ('TEXTCOLOR', (0, 0), (-1, 0), tenant.COLOR_WHITE),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, 0), self.FONT_BOLD),
-            ('FONTNAME', (0, 1), (-1, -1), self.FONT_NORMAL),
-            ('GRID', (0, 0), (-1, -1), 1, self.COLOR_BORDER),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [self.COLOR_WHITE, self.COLOR_LIGHT_GRAY_BG]),
+            ('FONTNAME', (0, 0), (-1, 0), tenant.FONT_BOLD),
+            ('FONTNAME', (0, 1), (-1, -1), tenant.FONT_NORMAL),
+            ('GRID', (0, 0), (-1, -1), 1, tenant.COLOR_BORDER),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [tenant.COLOR_WHITE, tenant.COLOR_LIGHT_GRAY_BG]),
         ]))
         
         table.wrapOn(c, width - 100, y_pos)
         table.drawOn(c, (width - 400) / 2, y_pos - table._height)
-        y_pos -= table._height + self.SPACE_MEDIUM
+        y_pos -= table._height + tenant.SPACE_MEDIUM
 
-        c.setFont(self.FONT_NORMAL, self.FONT_SIZE_BODY_SMALL)
-        c.setFillColor(self.COLOR_TEXT_LIGHT)
+        c.setFont(tenant.FONT_NORMAL, tenant.FONT_SIZE_BODY_SMALL)
+        c.setFillColor(tenant.COLOR_TEXT_LIGHT)
         c.drawCentredString(width/2, y_pos, "*Cálculos baseados em um reajuste anual médio de 5% na tarifa de energia.")
         
-        self._draw_footer(c, width)
+        self._draw_footer(c, width, tenant)
         c.showPage()
         
         # ========== PÁGINA 7: PRAZOS E ASSINATURA ==========
-        self.desenhar_fundo_interno(c, width, height)
-        self._draw_header_logo(c, height)
-        c.setFillColor(self.COLOR_PRIMARY_BLUE)
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_TITLE)
+        self.desenhar_fundo_interno(c, width, height, tenant)
+        self._draw_header_logo(c, height, tenant)
+        c.setFillColor(tenant.COLOR_PRIMARY_BLUE)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_TITLE)
         c.drawCentredString(width/2, height - 80, "Prazos e Validade")
 
         y_pos = height - 140
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_BODY)
-        c.setFillColor(self.COLOR_TEXT)
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_BODY)
+        c.setFillColor(tenant.COLOR_TEXT)
         c.drawString(70, y_pos, "PROPOSTA VÁLIDA POR 10 DIAS OU ENQUANTO DURAREM OS ESTOQUES.")
-        y_pos -= self.SPACE_MEDIUM
+        y_pos -= tenant.SPACE_MEDIUM
 
-        text_style = ParagraphStyle(name='Terms', fontName=self.FONT_NORMAL, fontSize=self.FONT_SIZE_BODY,
-                                      textColor=self.COLOR_TEXT, leading=self.LINE_SPACING, spaceAfter=self.SPACE_SMALL)
+        text_style = ParagraphStyle(name='Terms', fontName=tenant.FONT_NORMAL, fontSize=tenant.FONT_SIZE_BODY,
+                                      textColor=tenant.COLOR_TEXT, leading=tenant.LINE_SPACING, spaceAfter=tenant.SPACE_SMALL)
         
         text_items = [
             "<b>Entrega dos Equipamentos:</b> 30 a 60 dias após pagamento da entrada ou valor integral.",
@@ -586,44 +635,51 @@ class PDFGenerator:
             p = Paragraph(item, text_style)
             p_w, p_h = p.wrapOn(c, width - 140, y_pos)
             p.drawOn(c, 70, y_pos - p_h)
-            y_pos -= p_h + self.SPACE_SMALL
+            y_pos -= p_h + tenant.SPACE_SMALL
 
-        y_pos -= self.SPACE_MEDIUM
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_BODY)
+        y_pos -= tenant.SPACE_MEDIUM
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_BODY)
         c.drawString(70, y_pos, "No aceite desta proposta, favor preencher e assinar os campos abaixo:")
-        y_pos -= self.SPACE_LARGE
+        y_pos -= tenant.SPACE_LARGE
         
-        c.setFont(self.FONT_NORMAL, self.FONT_SIZE_BODY_LARGE)
-        c.drawString(70, y_pos, f"BAURU-SP, {datetime.now().strftime('%d/%m/%Y')}")
-        y_pos -= self.SPACE_LARGE
+        c.setFont(tenant.FONT_NORMAL, tenant.FONT_SIZE_BODY_LARGE)
+        c.drawString(70, y_pos, f"{tenant.local_assinatura}, {self.data_emissao(dados).strftime('%d/%m/%Y')}")
+        y_pos -= tenant.SPACE_LARGE
 
         fields = ["Nome/Razão Social:", "CPF/CNPJ:", "RG:"]
         field_x_start = [180, 130, 95]
         for i, field in enumerate(fields):
             c.drawString(70, y_pos, field)
             c.line(field_x_start[i], y_pos - 2, width - 70, y_pos - 2)
-            y_pos -= self.SPACE_LARGE
+            y_pos -= tenant.SPACE_LARGE
         
         y_pos -= 60
         try:
-            assinatura_path = os.path.join(self.assets_path, "assinatura_gabriel.png")
-            if os.path.exists(assinatura_path):
-                c.drawImage(assinatura_path, 70, y_pos, width=180, height=70, preserveAspectRatio=True, mask='auto')
+            assinatura = tenant.imagem("assinatura")
+            if assinatura is not None:
+                c.drawImage(assinatura, 70, y_pos, width=180, height=70, preserveAspectRatio=True, mask='auto')
         except: pass
         
         c.line(70, y_pos - 2, 350, y_pos - 2)
-        y_pos -= self.SPACE_SMALL
+        y_pos -= tenant.SPACE_SMALL
 
-        c.setFont(self.FONT_BOLD, self.FONT_SIZE_BODY_LARGE)
-        c.drawString(70, y_pos, "GABRIEL SHAYEB")
+        c.setFont(tenant.FONT_BOLD, tenant.FONT_SIZE_BODY_LARGE)
+        c.drawString(70, y_pos, tenant.signatario_nome)
         y_pos -= 15
-        c.setFont(self.FONT_NORMAL, self.FONT_SIZE_BODY)
-        details = ["Diretor", "Engenheiro Eletricista", "Engenheiro de Segurança do Trabalho", "CREA 5069575855"]
-        for detail in details:
+        c.setFont(tenant.FONT_NORMAL, tenant.FONT_SIZE_BODY)
+        for detail in tenant.signatario_detalhes:
             c.drawString(70, y_pos, detail)
             y_pos -= 14
 
-        self._draw_footer(c, width)
+        self._draw_footer(c, width, tenant)
         c.save()
         buffer.seek(0)
-        return buffer.getvalue()
+        pdf_bytes = buffer.getvalue()
+
+        # A escolha da requisição (True/False) prevalece; None segue o padrão do gerador
+        linearizado = dados.get("linearizado")
+        if linearizado is None:
+            linearizado = self.linearizado
+        if linearizado:
+            pdf_bytes = self.linearizar(pdf_bytes)
+        return pdf_bytes
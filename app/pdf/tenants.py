@@ -0,0 +1,123 @@
+from reportlab.lib import colors
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from collections import OrderedDict
+from io import BytesIO
+import threading
+import json
+import os
+import re
+
+
+class TenantNaoEncontrado(ValueError):
+    """O tenant solicitado não possui configuração no registro."""
+
+
+class TenantConfigInvalida(RuntimeError):
+    """A configuração do tenant não pode ser renderizada (erro do servidor, não da requisição)."""
+
+
+class Tenant:
+    """Identidade visual e textos de um integrador, prontos para renderização."""
+
+    # O rodapé começa em y=45 e desce 12pt por linha; a 5ª linha sairia da página
+    MAX_LINHAS_RODAPE = 4
+
+    def __init__(self, tenant_id, config, estilo_padrao, tenants_path):
+        self.id = tenant_id
+        self.nome = config.get("nome", tenant_id.upper())
+        self.assets_path = config.get("assets_path", os.path.join(tenants_path, tenant_id))
+
+        # --- ESTILOS (padrão do gerador + sobrescritas do tenant) ---
+        for chave, valor in estilo_padrao.items():
+            setattr(self, chave, valor)
+        for chave, valor in config.get("estilo", {}).items():
+            if chave not in estilo_padrao:
+                raise TenantConfigInvalida(f"Tenant '{tenant_id}': estilo desconhecido '{chave}'")
+            if chave.startswith("COLOR_") and not chave.endswith("_HEX"):
+                try:
+                    setattr(self, chave, colors.HexColor(valor))
+                except (ValueError, TypeError):
+                    raise TenantConfigInvalida(f"Tenant '{tenant_id}': cor inválida em {chave}: {valor!r}")
+                if f"{chave}_HEX" in estilo_padrao:
+                    setattr(self, f"{chave}_HEX", valor)
+            elif chave in ("FONT_BOLD", "FONT_NORMAL"):
+                try:
+                    pdfmetrics.getFont(valor)
+                except KeyError:
+                    raise TenantConfigInvalida(f"Tenant '{tenant_id}': fonte não registrada em {chave}: {valor!r}")
+                setattr(self, chave, valor)
+            else:
+                setattr(self, chave, valor)
+
+        # --- TEXTOS ---
+        self.rodape = config.get("rodape", [])
+        if len(self.rodape) > self.MAX_LINHAS_RODAPE:
+            raise TenantConfigInvalida(
+                f"Tenant '{tenant_id}': rodapé com {len(self.rodape)} linhas (máximo {self.MAX_LINHAS_RODAPE})"
+            )
+        self.local_assinatura = config.get("local_assinatura", "")
+        signatario = config.get("signatario", {})
+        self.signatario_nome = signatario.get("nome", "")
+        self.signatario_detalhes = signatario.get("detalhes", [])
+        marcas = config.get("marcas", {})
+        self.marcas_modulos = marcas.get("modulos", "")
+        self.marcas_inversores = marcas.get("inversores", "")
+
+        # --- IMAGENS (lidas do disco uma única vez) ---
+        self.imagens = {}
+        for chave, arquivo in config.get("imagens", {}).items():
+            caminho = os.path.join(self.assets_path, arquivo)
+            if os.path.exists(caminho):
+                with open(caminho, "rb") as f:
+                    self.imagens[chave] = ImageReader(BytesIO(f.read()))
+
+    def imagem(self, chave):
+        """Retorna a imagem preparada para a chave, ou None se o tenant não a possui."""
+        return self.imagens.get(chave)
+
+
+class TenantRegistry:
+    """
+    Registro de tenants carregados sob demanda e mantidos em um cache LRU.
+
+    Cada tenant é descrito por um arquivo `<tenant_id>.json` em `tenants_path`; sem
+    `assets_path` na configuração, as imagens ficam em `<tenants_path>/<tenant_id>/`.
+    """
+
+    TENANT_ID_PATTERN = re.compile(r"^[a-z0-9_-]+$")
+
+    def __init__(self, estilo_padrao, tenants_path=None, tenant_padrao=None, max_tenants=None):
+        self.estilo_padrao = estilo_padrao
+        self.tenants_path = tenants_path or os.getenv("TENANTS_PATH", "app/data/tenants/")
+        self.tenant_padrao = tenant_padrao or os.getenv("DEFAULT_TENANT", "levesol")
+        self.max_tenants = max_tenants or int(os.getenv("TENANT_CACHE_SIZE", "8"))
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, tenant_id=None):
+        """Retorna o tenant solicitado (ou o padrão), carregando-o no primeiro uso."""
+        tenant_id = (tenant_id or self.tenant_padrao).strip().lower()
+        with self._lock:
+            if tenant_id in self._cache:
+                self._cache.move_to_end(tenant_id)
+                return self._cache[tenant_id]
+
+        tenant = self._carregar(tenant_id)
+
+        with self._lock:
+            self._cache[tenant_id] = tenant
+            self._cache.move_to_end(tenant_id)
+            while len(self._cache) > self.max_tenants:
+                self._cache.popitem(last=False)
+        return tenant
+
+    def _carregar(self, tenant_id):
+        if not self.TENANT_ID_PATTERN.match(tenant_id):
+            raise ValueError(f"Tenant inválido: '{tenant_id}'")
+        config_path = os.path.join(self.tenants_path, f"{tenant_id}.json")
+        if not os.path.exists(config_path):
+            raise TenantNaoEncontrado(f"Tenant não encontrado: '{tenant_id}'")
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        return Tenant(tenant_id, config, self.estilo_padrao, self.tenants_path)
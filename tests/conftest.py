@@ -0,0 +1,26 @@
+import json
+import os
+
+import pytest
+
+from app.models.input_data import PropostaInput, montar_dados_pdf
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(REPO_ROOT, "tests", "fixtures")
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    # Assets, tenants e índice de municípios são resolvidos a partir da raiz do repositório
+    monkeypatch.chdir(REPO_ROOT)
+
+
+@pytest.fixture
+def proposta():
+    with open(os.path.join(FIXTURES, "proposta.json"), "r", encoding="utf-8") as f:
+        return PropostaInput.model_validate(json.load(f))
+
+
+@pytest.fixture
+def dados_pdf(proposta):
+    return montar_dados_pdf(proposta, proposta.data_emissao)
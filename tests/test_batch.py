@@ -0,0 +1,100 @@
+"""CLI de geração em lote: retomada, data do lote, duplicados e validação de argumentos."""
+from datetime import date
+import json
+import os
+
+import pytest
+
+from app.pdf import batch
+from tests.conftest import FIXTURES
+
+
+@pytest.fixture
+def entrada(tmp_path):
+    # Registro sem data_emissao (usa a do lote), repetido, e uma linha inválida
+    with open(os.path.join(FIXTURES, "proposta.json"), "r", encoding="utf-8") as f:
+        registro = json.load(f)
+    del registro["data_emissao"]
+    linha = json.dumps(registro, ensure_ascii=False)
+
+    caminho = tmp_path / "propostas.jsonl"
+    caminho.write_text(f"{linha}\n\n{linha}\n{{\"cliente\": {{}}}}\n", encoding="utf-8")
+    return str(caminho)
+
+
+def _manifesto(output):
+    with open(os.path.join(output, batch.MANIFEST), "r", encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f]
+
+
+class _Data(date):
+    hoje = None
+
+    @classmethod
+    def today(cls):
+        return cls.hoje
+
+
+def test_retomada_pula_gerados_e_reaproveita_data_do_lote(tmp_path, entrada, monkeypatch, capsys):
+    output = str(tmp_path / "saida")
+    monkeypatch.setattr(batch, "date", _Data)
+    monkeypatch.setattr(_Data, "hoje", date(2025, 10, 31))
+
+    assert batch.main([entrada, "-o", output, "--workers", "1"]) == 1  # a linha inválida falha
+    primeira = _manifesto(output)
+    assert [(e["linha"], e["status"]) for e in sorted(primeira, key=lambda e: e["linha"])] == [
+        (1, "ok"), (3, "duplicado"), (4, "erro")
+    ]
+    ok = next(e for e in primeira if e["status"] == "ok")
+    assert ok["numero_proposta"] == "311025/2025"
+    assert os.path.exists(os.path.join(output, ok["arquivo"]))
+    assert not [nome for nome in os.listdir(output) if nome.endswith(".tmp")]
+    with open(os.path.join(output, batch.LOTE), "r", encoding="utf-8") as f:
+        assert json.load(f) == {"data_emissao": "2025-10-31"}
+
+    # Retomada depois da meia-noite: mesma data do lote, nada é gerado de novo
+    monkeypatch.setattr(_Data, "hoje", date(2025, 11, 1))
+    capsys.readouterr()
+    assert batch.main([entrada, "-o", output, "--workers", "1"]) == 1
+    assert "3 registros, 2 já gerados, 0 duplicados, 1 pendentes" in capsys.readouterr().out
+    assert [e["status"] for e in _manifesto(output)[len(primeira):]] == ["erro"]
+
+
+def test_data_explicita_substitui_a_do_lote(tmp_path, entrada):
+    output = str(tmp_path / "saida")
+    batch.main([entrada, "-o", output, "--workers", "1", "--data-emissao", "2025-10-01"])
+    batch.main([entrada, "-o", output, "--workers", "1", "--data-emissao", "2025-10-02"])
+
+    gerados = [e for e in _manifesto(output) if e["status"] == "ok"]
+    assert [e["numero_proposta"] for e in gerados] == ["011025/2025", "021025/2025"]
+    assert gerados[0]["chave"] != gerados[1]["chave"]
+
+
+def test_chave_inclui_data_efetiva():
+    linha = '{"cliente": {"nome": "A"}}'
+    assert batch._chave(linha, date(2025, 10, 1)) == batch._chave(linha, date(2025, 10, 1))
+    assert batch._chave(linha, date(2025, 10, 1)) != batch._chave(linha, date(2025, 10, 2))
+
+    # A data do próprio registro prevalece sobre a do lote
+    com_data = '{"cliente": {"nome": "A"}, "data_emissao": "2025-10-01"}'
+    assert batch._chave(com_data, date(2025, 10, 1)) == batch._chave(com_data, date(2030, 1, 1))
+
+
+def test_chaves_concluidas_exige_pdf_no_disco(tmp_path):
+    (tmp_path / "a.pdf").write_bytes(b"%PDF")
+    (tmp_path / batch.MANIFEST).write_text(
+        '{"chave": "a", "status": "ok", "arquivo": "a.pdf"}\n'
+        '{"chave": "b", "status": "ok", "arquivo": "b.pdf"}\n'
+        '{"chave": "c", "status": "erro"}\n'
+        '{"chave": "d", "sta',
+        encoding="utf-8"
+    )
+    assert batch._chaves_concluidas(str(tmp_path)) == {"a"}
+
+
+@pytest.mark.parametrize("opcao", ["--workers", "--chunksize"])
+@pytest.mark.parametrize("valor", ["0", "-1", "dois"])
+def test_valores_invalidos_sao_rejeitados(tmp_path, entrada, opcao, valor):
+    with pytest.raises(SystemExit) as erro:
+        batch.main([entrada, "-o", str(tmp_path / "saida"), opcao, valor])
+    assert erro.value.code == 2
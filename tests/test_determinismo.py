@@ -0,0 +1,95 @@
+"""
+Golden-file da renderização determinística.
+
+O hash em tests/golden/ vale para as versões fixadas em requirements.txt (reportlab,
+matplotlib, Pillow). Após uma mudança intencional no layout ou nas dependências,
+regenere com:
+    UPDATE_GOLDEN=1 python -m pytest tests/test_determinismo.py
+"""
+from datetime import date, datetime
+import subprocess
+import hashlib
+import sys
+import re
+import os
+
+import pytest
+
+from app.pdf.generator import PDFGenerator
+from tests.conftest import REPO_ROOT
+
+GOLDEN = os.path.join(REPO_ROOT, "tests", "golden", "proposta_deterministica.sha256")
+
+SCRIPT_SUBPROCESSO = """
+import hashlib, json, sys
+from datetime import datetime
+from app.models.input_data import PropostaInput, montar_dados_pdf
+from app.pdf.generator import PDFGenerator
+from tests.conftest import FIXTURES
+
+with open(FIXTURES + "/proposta.json", encoding="utf-8") as f:
+    proposta = PropostaInput.model_validate(json.load(f))
+dados = montar_dados_pdf(proposta, proposta.data_emissao)
+gerador = PDFGenerator(deterministico=True, relogio=lambda: datetime(2025, 10, 1))
+sys.stdout.write(hashlib.sha256(gerador.criar_proposta_completa(dados)).hexdigest())
+"""
+
+
+def _sha256(pdf_bytes):
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+@pytest.fixture
+def gerador():
+    return PDFGenerator(deterministico=True, relogio=lambda: datetime(2025, 10, 1))
+
+
+def test_renderizacao_igual_ao_golden(gerador, dados_pdf):
+    digest = _sha256(gerador.criar_proposta_completa(dados_pdf))
+    if os.getenv("UPDATE_GOLDEN"):
+        with open(GOLDEN, "w") as f:
+            f.write(digest + "\n")
+    with open(GOLDEN) as f:
+        assert digest == f.read().strip()
+
+
+def test_renderizacoes_repetidas_sao_identicas(gerador, dados_pdf):
+    assert gerador.criar_proposta_completa(dados_pdf) == gerador.criar_proposta_completa(dados_pdf)
+
+
+def test_outro_processo_com_outro_hashseed(gerador, dados_pdf):
+    env = dict(os.environ, PYTHONHASHSEED="12345")
+    resultado = subprocess.run(
+        [sys.executable, "-c", SCRIPT_SUBPROCESSO],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    assert resultado.stdout == _sha256(gerador.criar_proposta_completa(dados_pdf))
+
+
+def test_relogio_injetado_define_a_data(gerador, dados_pdf):
+    # Sem data_emissao nos dados, a data vem do relógio do gerador
+    del dados_pdf["data_emissao"]
+    assert gerador.data_emissao(dados_pdf) == datetime(2025, 10, 1)
+    com_relogio = gerador.criar_proposta_completa(dados_pdf)
+    with open(GOLDEN) as f:
+        assert _sha256(com_relogio) == f.read().strip()
+
+    outro_dia = PDFGenerator(deterministico=True, relogio=lambda: datetime(2025, 10, 2))
+    assert outro_dia.criar_proposta_completa(dados_pdf) != com_relogio
+
+
+def test_data_emissao_tem_prioridade_sobre_relogio(dados_pdf):
+    gerador = PDFGenerator(deterministico=True, relogio=lambda: datetime(2030, 1, 1))
+    assert gerador.data_emissao(dados_pdf) == date(2025, 10, 1)
+
+
+def test_modo_nao_deterministico_varia_metadados(dados_pdf):
+    gerador = PDFGenerator(deterministico=False, relogio=lambda: datetime(2025, 10, 1))
+    primeiro = gerador.criar_proposta_completa(dados_pdf)
+    segundo = gerador.criar_proposta_completa(dados_pdf)
+
+    assert b"/CreationDate (D:20000101000000" not in primeiro
+    # Sem invariant, o reportlab deriva o /ID do horário da renderização
+    assert primeiro != segundo
+    id_pdf = re.compile(rb"/ID\s*\[(<[0-9a-f]+>)")
+    assert id_pdf.search(primeiro).group(1) != id_pdf.search(segundo).group(1)
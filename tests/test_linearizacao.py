@@ -0,0 +1,86 @@
+from datetime import datetime
+from io import BytesIO
+import hashlib
+import re
+
+import pikepdf
+import pytest
+
+from app.pdf.generator import PDFGenerator
+from tests.test_determinismo import GOLDEN
+
+
+@pytest.fixture
+def gerador():
+    return PDFGenerator(deterministico=True, relogio=lambda: datetime(2025, 10, 1), linearizado=False)
+
+
+@pytest.fixture
+def pdf_linearizado(gerador, dados_pdf):
+    dados_pdf["linearizado"] = True
+    return gerador.criar_proposta_completa(dados_pdf)
+
+
+def _offset_objeto(pdf_bytes, numero):
+    match = re.search(rb"^%d 0 obj" % numero, pdf_bytes, re.MULTILINE)
+    assert match, f"objeto {numero} não encontrado"
+    return match.start()
+
+
+def _parametros_linearizacao(pdf_bytes):
+    # O dicionário de linearização precisa estar no primeiro objeto, nos primeiros 1024 bytes
+    cabecalho = pdf_bytes[:1024]
+    assert b"/Linearized 1" in cabecalho
+    hint = re.search(rb"/H \[ ?(\d+) (\d+)", cabecalho)
+    fim_primeira_pagina = re.search(rb"/E (\d+)", cabecalho)
+    objeto_primeira_pagina = re.search(rb"/O (\d+)", cabecalho)
+    return int(hint.group(1)), int(fim_primeira_pagina.group(1)), int(objeto_primeira_pagina.group(1))
+
+
+def test_pdf_linearizado_e_valido(pdf_linearizado):
+    with pikepdf.open(BytesIO(pdf_linearizado)) as pdf:
+        assert pdf.is_linearized
+        assert pdf.check_linearization()
+        assert len(pdf.pages) == 7
+
+
+def test_hints_e_capa_no_inicio_do_arquivo(pdf_linearizado):
+    offset_hint, fim_primeira_pagina, objeto_primeira_pagina = _parametros_linearizacao(pdf_linearizado)
+    assert offset_hint < fim_primeira_pagina
+
+    with pikepdf.open(BytesIO(pdf_linearizado)) as pdf:
+        capa = pdf.pages[0].obj
+        assert capa.objgen[0] == objeto_primeira_pagina
+        xobjects = capa.Resources.XObject
+        imagens_capa = [xobjects[nome].objgen[0] for nome in xobjects.keys()]
+        segunda_pagina = pdf.pages[1].obj.objgen[0]
+
+    # /E é o fim da seção da página 1: capa e imagem de fundo antes, demais páginas a partir dele
+    assert imagens_capa
+    assert _offset_objeto(pdf_linearizado, objeto_primeira_pagina) < fim_primeira_pagina
+    for numero in imagens_capa:
+        assert _offset_objeto(pdf_linearizado, numero) < fim_primeira_pagina
+    assert _offset_objeto(pdf_linearizado, segunda_pagina) >= fim_primeira_pagina
+
+
+def test_linearizado_e_deterministico(gerador, dados_pdf, pdf_linearizado):
+    assert gerador.criar_proposta_completa(dados_pdf) == pdf_linearizado
+
+
+def test_sem_linearizacao_saida_inalterada(gerador, dados_pdf):
+    dados_pdf["linearizado"] = False
+    desligado = gerador.criar_proposta_completa(dados_pdf)
+    dados_pdf["linearizado"] = None
+    assert gerador.criar_proposta_completa(dados_pdf) == desligado
+
+    with open(GOLDEN) as f:
+        assert hashlib.sha256(desligado).hexdigest() == f.read().strip()
+    with pikepdf.open(BytesIO(desligado)) as pdf:
+        assert not pdf.is_linearized
+
+
+def test_requisicao_prevalece_sobre_padrao_do_gerador(dados_pdf):
+    gerador = PDFGenerator(deterministico=True, relogio=lambda: datetime(2025, 10, 1), linearizado=True)
+    dados_pdf["linearizado"] = False
+    with pikepdf.open(BytesIO(gerador.criar_proposta_completa(dados_pdf))) as pdf:
+        assert not pdf.is_linearized
@@ -0,0 +1,109 @@
+"""Índice binário de municípios: geração, normalização das buscas e arquivos inválidos."""
+import os
+
+import pytest
+
+from app.core.localidades import MAGIC, IndiceLocalidades, construir_indice, normalizar_cidade
+from app.pdf.generator import PDFGenerator
+from tests.conftest import REPO_ROOT
+
+CSV = os.path.join(REPO_ROOT, "app", "data", "municipios.csv")
+IDX = os.path.join(REPO_ROOT, "app", "data", "municipios.idx")
+with open(IDX, "rb") as f:
+    IDX_BYTES = f.read()
+
+
+@pytest.fixture(scope="module")
+def indice():
+    return IndiceLocalidades(IDX)
+
+
+def test_indice_versionado_corresponde_ao_csv(tmp_path):
+    gerado = tmp_path / "municipios.idx"
+    construir_indice(CSV, str(gerado))
+    assert gerado.read_bytes() == IDX_BYTES, "regenere app/data/municipios.idx a partir do CSV"
+
+
+@pytest.mark.parametrize("cidade", ["Bauru-SP", "bauru/sp", "BAURU - SP", "Bauru"])
+def test_busca_normaliza_cidade(indice, cidade):
+    assert indice.buscar(cidade) == {"concessionaria": "CPFL Paulista", "tensao": "127/220V", "radiacao_solar": 5.07}
+
+
+def test_busca_ignora_acentos(indice):
+    assert indice.buscar("São Paulo - SP")["concessionaria"] == "Enel SP"
+    assert indice.buscar("Jau") == indice.buscar("Jaú/SP")
+    assert indice.buscar("Jau")["radiacao_solar"] == 5.08
+
+
+@pytest.mark.parametrize("cidade", ["Cidade Inexistente-SP", "Bauru-RJ", "", None])
+def test_cidade_desconhecida(indice, cidade):
+    assert indice.buscar(cidade) is None
+
+
+def test_normalizar_cidade():
+    assert normalizar_cidade("Ibitinga/SP") == "ibitinga|sp"
+    assert normalizar_cidade("São Paulo - sp") == "sao paulo|sp"
+    assert normalizar_cidade("Bauru") == "bauru"
+    assert normalizar_cidade("Santa Rita do Passa Quatro") == "santa rita do passa quatro"
+
+
+def test_nome_ambiguo_so_com_uf(tmp_path):
+    csv_path = tmp_path / "municipios.csv"
+    csv_path.write_text(
+        "municipio,uf,concessionaria,tensao,radiacao_solar\n"
+        "Bom Jesus,RS,RGE,127/220V,4.60\n"
+        "Bom Jesus,PI,Equatorial PI,220/380V,5.90\n"
+        "Bauru,SP,CPFL Paulista,127/220V,5.07\n",
+        encoding="utf-8"
+    )
+    idx_path = str(tmp_path / "municipios.idx")
+    assert construir_indice(str(csv_path), idx_path) == (3, 4)  # 3 com UF + "bauru"
+
+    indice = IndiceLocalidades(idx_path)
+    assert indice.buscar("Bom Jesus") is None
+    assert indice.buscar("Bom Jesus-RS")["concessionaria"] == "RGE"
+    assert indice.buscar("bom jesus/pi")["tensao"] == "220/380V"
+    assert indice.buscar("Bauru")["radiacao_solar"] == 5.07
+
+
+def test_municipio_duplicado_no_csv(tmp_path):
+    csv_path = tmp_path / "municipios.csv"
+    csv_path.write_text(
+        "municipio,uf,concessionaria,tensao,radiacao_solar\n"
+        "Bauru,SP,CPFL Paulista,127/220V,5.07\n"
+        "BAURU,sp,CPFL Paulista,127/220V,5.07\n",
+        encoding="utf-8"
+    )
+    with pytest.raises(ValueError, match="duplicado"):
+        construir_indice(str(csv_path), str(tmp_path / "municipios.idx"))
+
+
+def test_indice_ausente_usa_padroes(tmp_path):
+    indice = IndiceLocalidades(str(tmp_path / "inexistente.idx"))
+    indice.abrir()
+    assert indice.buscar("Bauru-SP") is None
+
+
+@pytest.mark.parametrize("conteudo", [
+    b"MUNIDX01" + IDX_BYTES[len(MAGIC):],  # versão anterior do formato
+    MAGIC + b"\x00" * 4,                   # cabeçalho truncado
+    IDX_BYTES[:200],                       # tabela truncada
+    b"",
+])
+def test_indice_invalido_falha_sempre(tmp_path, conteudo):
+    caminho = tmp_path / "municipios.idx"
+    caminho.write_bytes(conteudo)
+    indice = IndiceLocalidades(str(caminho))
+
+    # RuntimeError (não ValueError): a API responde 500, não 400, e não cai nos padrões
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="Índice de localidades inválido"):
+            indice.buscar("Bauru-SP")
+
+
+def test_gerador_valida_indice_na_inicializacao(tmp_path, monkeypatch):
+    caminho = tmp_path / "municipios.idx"
+    caminho.write_bytes(b"XXXXXXXX" + b"\x00" * 12)
+    monkeypatch.setenv("LOCALIDADES_INDEX", str(caminho))
+    with pytest.raises(RuntimeError):
+        PDFGenerator()
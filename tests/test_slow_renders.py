@@ -0,0 +1,101 @@
+"""Captura de renderizações lentas: contadores, buffer circular, máscara e ids de captura."""
+import json
+import time
+import zipfile
+
+import pytest
+
+from app.core.slow_renders import SlowRenderCapture
+
+
+def render_lento(dados):
+    for _ in range(20):
+        time.sleep(0.002)
+    return b"%PDF"
+
+
+def render_com_erro(dados):
+    raise ValueError("Tenant inválido")
+
+
+@pytest.fixture
+def capturas(tmp_path, monkeypatch):
+    monkeypatch.setenv("SLOW_RENDER_STACK_INTERVAL_MS", "1")
+    return SlowRenderCapture(diretorio=str(tmp_path), limite_ms=1, taxa_amostragem=0, max_capturas=3)
+
+
+@pytest.fixture
+def dados():
+    return {
+        "numero_proposta": "011025/2025",
+        "cliente": {
+            "nome": "João da Silva",
+            "endereco": "Rua das Flores, 123 - CEP 17000-000",
+            "telefone": "(14) 99999-9999",
+            "cidade": "Bauru-SP"
+        }
+    }
+
+
+def test_renderizacao_lenta_gera_captura(capturas, dados):
+    assert capturas.executar(render_lento, dados) == b"%PDF"
+    assert (capturas.renderizacoes, capturas.renderizacoes_lentas) == (1, 1)
+
+    [captura] = capturas.listar()
+    with zipfile.ZipFile(capturas.caminho_captura(captura["id"])) as zf:
+        entrada = json.loads(zf.read("input.json"))
+        assert sorted(zf.namelist()) == sorted(entrada["arquivos"])
+        folded = zf.read("stacks.folded").decode("utf-8")
+    assert entrada["perfilado"] is False
+    assert "profile.pstats" not in entrada["arquivos"]
+
+    # Cada função aparece com a linha em que foi definida, não a linha em execução
+    linha_def = render_lento.__code__.co_firstlineno
+    rotulos = {f for pilha in folded.splitlines() for f in pilha.rsplit(" ", 1)[0].split(";")}
+    assert f"render_lento (test_slow_renders.py:{linha_def})" in rotulos
+    assert len({r for r in rotulos if r.startswith("render_lento ")}) == 1
+
+
+def test_captura_perfilada_inclui_pstats(tmp_path, dados):
+    capturas = SlowRenderCapture(diretorio=str(tmp_path), limite_ms=1, taxa_amostragem=1)
+    capturas.executar(render_lento, dados)
+
+    [captura] = capturas.listar()
+    with zipfile.ZipFile(capturas.caminho_captura(captura["id"])) as zf:
+        assert {"profile.pstats", "stats.txt"} <= set(zf.namelist())
+        assert json.loads(zf.read("input.json"))["perfilado"] is True
+
+
+def test_renderizacao_com_erro_nao_e_contada(capturas, dados):
+    with pytest.raises(ValueError):
+        capturas.executar(render_com_erro, dados)
+    assert (capturas.renderizacoes, capturas.renderizacoes_lentas) == (0, 0)
+    assert capturas.listar() == []
+
+
+def test_buffer_circular_mantem_as_mais_recentes(capturas, dados):
+    for _ in range(5):
+        capturas.executar(render_lento, dados)
+    assert capturas.renderizacoes_lentas == 5
+    assert len(capturas.listar()) == capturas.max_capturas
+
+
+def test_mascarar_preserva_formato(capturas, dados):
+    mascarado = capturas._mascarar(dados)
+
+    assert mascarado["cliente"]["nome"] == "xxxx xx xxxxx"
+    assert mascarado["cliente"]["endereco"] == "xxx xxx xxxxxx, 000 - CEP 00000-000"
+    assert mascarado["cliente"]["telefone"] == "(00) 00000-0000"
+    assert mascarado["cliente"]["cidade"] == "Bauru-SP"
+    assert mascarado["numero_proposta"] == "011025/2025"
+    assert dados["cliente"]["nome"] == "João da Silva"  # a entrada original não é alterada
+
+
+@pytest.mark.parametrize("captura_id", [
+    "../segredo",
+    "../../etc/passwd",
+    "20251001T120000_1500ms_abcdef12/../x",
+    "20251001T120000_1500ms_ABCDEF12",
+])
+def test_id_de_captura_invalido(capturas, captura_id):
+    assert capturas.caminho_captura(captura_id) is None
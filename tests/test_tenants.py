@@ -0,0 +1,95 @@
+"""Registro de tenants: cache LRU, erros de carregamento e validação da configuração."""
+import json
+import os
+
+import pytest
+from reportlab.lib import colors
+
+from app.pdf.generator import PDFGenerator
+from app.pdf.tenants import TenantConfigInvalida, TenantNaoEncontrado, TenantRegistry
+
+
+@pytest.fixture(scope="module")
+def estilo_padrao():
+    return PDFGenerator()._estilo_padrao()
+
+
+def _criar_tenant(tenants_path, tenant_id, **config):
+    with open(os.path.join(tenants_path, f"{tenant_id}.json"), "w", encoding="utf-8") as f:
+        json.dump({"nome": tenant_id.upper(), **config}, f)
+
+
+@pytest.fixture
+def registro(tmp_path, estilo_padrao):
+    for tenant_id in ("alfa", "beta"):
+        _criar_tenant(tmp_path, tenant_id)
+    return TenantRegistry(estilo_padrao, tenants_path=str(tmp_path), tenant_padrao="alfa", max_tenants=1)
+
+
+def test_cache_lru_descarta_o_menos_recente(registro):
+    alfa = registro.obter("alfa")
+    assert registro.obter("ALFA ") is alfa
+    assert list(registro._cache) == ["alfa"]
+
+    beta = registro.obter("beta")
+    assert list(registro._cache) == ["beta"]
+    assert registro.obter("beta") is beta
+    assert registro.obter("alfa") is not alfa  # recarregado após ser descartado
+
+
+def test_move_to_end_preserva_o_mais_usado(tmp_path, estilo_padrao):
+    for tenant_id in ("alfa", "beta", "gama"):
+        _criar_tenant(tmp_path, tenant_id)
+    registro = TenantRegistry(estilo_padrao, tenants_path=str(tmp_path), max_tenants=2)
+
+    registro.obter("alfa")
+    registro.obter("beta")
+    registro.obter("alfa")
+    registro.obter("gama")
+    assert list(registro._cache) == ["alfa", "gama"]
+
+
+def test_tenant_padrao(registro):
+    assert registro.obter().id == "alfa"
+    assert registro.obter("").id == "alfa"
+
+
+def test_tenant_desconhecido(registro):
+    with pytest.raises(TenantNaoEncontrado):
+        registro.obter("inexistente")
+
+
+@pytest.mark.parametrize("tenant_id", ["../levesol", "a/b", "tenant.json", "ação"])
+def test_tenant_id_malformado(registro, tenant_id):
+    with pytest.raises(ValueError, match="Tenant inválido"):
+        registro.obter(tenant_id)
+
+
+def test_cor_sobrescrita_atualiza_hex(tmp_path, estilo_padrao):
+    _criar_tenant(tmp_path, "verde", estilo={"COLOR_TEXT": "#00AA00"})
+    tenant = TenantRegistry(estilo_padrao, tenants_path=str(tmp_path)).obter("verde")
+
+    assert tenant.COLOR_TEXT == colors.HexColor("#00AA00")
+    assert tenant.COLOR_TEXT_HEX == "#00AA00"  # usado pelo gráfico do matplotlib
+    assert tenant.COLOR_PRIMARY_BLUE == estilo_padrao["COLOR_PRIMARY_BLUE"]
+
+
+@pytest.mark.parametrize("config, mensagem", [
+    ({"estilo": {"FONT_BOLD": "Inexistente-Bold"}}, "fonte não registrada"),
+    ({"estilo": {"COLOR_PRIMARY_BLUE": "azul"}}, "cor inválida"),
+    ({"estilo": {"COLOR_INEXISTENTE": "#000000"}}, "estilo desconhecido"),
+    ({"rodape": ["linha"] * 5}, "rodapé com 5 linhas"),
+])
+def test_configuracao_invalida_falha_ao_carregar(tmp_path, estilo_padrao, config, mensagem):
+    _criar_tenant(tmp_path, "quebrado", **config)
+    registro = TenantRegistry(estilo_padrao, tenants_path=str(tmp_path))
+
+    with pytest.raises(TenantConfigInvalida, match=mensagem):
+        registro.obter("quebrado")
+    assert not isinstance(TenantConfigInvalida(), ValueError)  # vira 500, não 400
+
+
+def test_fonte_padrao_do_reportlab_e_aceita(tmp_path, estilo_padrao):
+    _criar_tenant(tmp_path, "serifa", estilo={"FONT_BOLD": "Times-Bold"})
+    tenant = TenantRegistry(estilo_padrao, tenants_path=str(tmp_path)).obter("serifa")
+    assert tenant.FONT_BOLD == "Times-Bold"